@@ -2,13 +2,16 @@
 Configuration management for AI Productivity Dashboard
 """
 import os
-from typing import Optional
-from pydantic import BaseSettings
+from functools import lru_cache
+from typing import List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings with environment variable support"""
     
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
+    
     # Google OAuth Configuration
     google_client_id: str
     google_client_secret: str
@@ -21,11 +24,12 @@ class Settings(BaseSettings):
     
     # Database Configuration
     database_url: str = "sqlite:///./productivity_dashboard.db"
+    redis_url: Optional[str] = None  # shares rate limits across workers when set
     
     # Application Configuration
     environment: str = "development"
     debug: bool = False
-    cors_origins: list = ["http://localhost:3000", "http://localhost:5173"]
+    cors_origins: List[str] = ["http://localhost:3000", "http://localhost:5173"]
     
     # API Configuration
     api_v1_prefix: str = "/api/v1"
@@ -35,16 +39,23 @@ class Settings(BaseSettings):
     
     # AI Model Configuration
     ai_model_cache_dir: str = "./models"
-    summarization_model: str = "facebook/bart-large-cnn"
+    summarization_model: str = "sshleifer/distilbart-cnn-12-6"
+    quantize_summarizer: bool = False  # int8 ONNX Runtime model, needs optimum[onnxruntime]
     classification_model: str = "all-MiniLM-L6-v2"
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    ml_max_workers: int = 4  # hard cap on ML threads; half the CPU count is used when lower
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the application settings, reading the environment on first use"""
+    return Settings()
 
 
-# Global settings instance
-settings = Settings()
+def __getattr__(name: str):
+    """Resolve the legacy module-level ``settings`` lazily"""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Google OAuth Scopes
 GOOGLE_SCOPES = [
@@ -2,27 +2,40 @@
 AI Productivity Dashboard - FastAPI Backend
 A production-ready API for Gmail, Drive, and Calendar integration with AI insights
 """
+import asyncio
+import importlib
 import logging.config
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
+from fastapi.encoders import jsonable_encoder
 import uvicorn
 
-from config import settings, LOGGING_CONFIG
+from config import get_settings, LOGGING_CONFIG
 from schemas import HealthCheck, ErrorResponse
 from routes import gmail, drive, calendar
+from services.ai_loader import get_ai_service
 from services.oauth_handler import oauth_router
 from models.database import db
-from utils import rate_limiter
+from utils import get_rate_limiter
 
 # Configure logging
 logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger(__name__)
 
 
+async def preload_ai_models():
+    """Import the AI service off the event loop, then load its models"""
+    try:
+        module = await asyncio.to_thread(importlib.import_module, "services.ai_summary")
+        await module.ai_service.preload()
+    except Exception as e:
+        logger.warning(f"AI model initialization warning: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
@@ -37,19 +50,21 @@ async def lifespan(app: FastAPI):
         logger.error(f"Database initialization failed: {e}")
         raise
     
-    # Initialize AI models (in background to avoid blocking startup)
-    try:
-        from services.ai_summary import ai_service
-        logger.info("AI models loading in background...")
-    except Exception as e:
-        logger.warning(f"AI model initialization warning: {e}")
+    # Initialize AI models in background so startup is not blocked
+    ai_preload = asyncio.create_task(preload_ai_models())
+    logger.info("AI models loading in background...")
     
     yield
     
+    ai_preload.cancel()
+    
     # Shutdown
     logger.info("Shutting down AI Productivity Dashboard API...")
 
 
+# Settings are read once, when the application is assembled
+settings = get_settings()
+
 # Create FastAPI application
 app = FastAPI(
     title="AI Productivity Dashboard API",
@@ -57,6 +72,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.environment == "development" else None,
     redoc_url="/redoc" if settings.environment == "development" else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -77,18 +93,21 @@ app.add_middleware(
 )
 
 
+# Health and docs probes are never rate limited
+RATE_LIMIT_EXEMPT_PATHS = frozenset({"/", "/health", "/docs", "/redoc", "/openapi.json"})
+
+
 # Rate limiting middleware
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
     """Apply rate limiting to API requests"""
-    client_ip = request.client.host
-    
-    # Skip rate limiting for health checks
-    if request.url.path in ["/", "/health"]:
+    if request.scope["path"] in RATE_LIMIT_EXEMPT_PATHS:
         return await call_next(request)
     
-    if not rate_limiter.is_allowed(client_ip):
-        return JSONResponse(
+    client_ip = request.client.host
+    
+    if not await get_rate_limiter().is_allowed_async(client_ip):
+        return ORJSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             content={"error": "Rate limit exceeded", "message": "Too many requests"}
         )
@@ -101,13 +120,13 @@ async def rate_limit_middleware(request: Request, call_next):
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle request validation errors"""
     logger.warning(f"Validation error for {request.url}: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=ErrorResponse(
             error="Validation Error",
             message="Invalid request data",
-            details={"errors": exc.errors()}
-        ).dict()
+            details={"errors": jsonable_encoder(exc.errors())}
+        ).model_dump(mode="json")
     )
 
 
@@ -115,12 +134,12 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions"""
     logger.error(f"HTTP error for {request.url}: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse(
             error=f"HTTP {exc.status_code}",
             message=exc.detail
-        ).dict()
+        ).model_dump(mode="json")
     )
 
 
@@ -128,12 +147,12 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions"""
     logger.error(f"Unexpected error for {request.url}: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ErrorResponse(
             error="Internal Server Error",
             message="An unexpected error occurred"
-        ).dict()
+        ).model_dump(mode="json")
     )
 
 
@@ -172,8 +191,7 @@ async def health_check():
     
     # Check AI service
     try:
-        from services.ai_summary import ai_service
-        services["ai_models"] = "healthy" if ai_service.summarizer else "loading"
+        services["ai_models"] = "healthy" if get_ai_service().summarizer else "loading"
     except Exception:
         services["ai_models"] = "unhealthy"
     
@@ -1,16 +1,37 @@
 from fastapi import APIRouter, HTTPException, Header
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
-from services.ai_summary import ai_service
-from datetime import datetime, timedelta
-from typing import List, Dict
+from services.ai_loader import get_ai_service
+from services.google_api import execute_async, get_service
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Optional
+import asyncio
+import re
 
 router = APIRouter()
 
+# Zoom, Google Meet, Teams and Webex links in a single pass
+MEETING_LINK_RE = re.compile(
+    r'https://(?:[a-zA-Z0-9.-]+\.zoom\.us|meet\.google\.com|teams\.microsoft\.com|[a-zA-Z0-9.-]+\.webex\.com)/[^\s]+'
+)
+
+# Timestamp format for Calendar API timeMin/timeMax (always UTC)
+RFC3339_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+@dataclass(slots=True)
+class EventRecord:
+    """Processed calendar event; slotted to keep large listings compact"""
+    id: str
+    summary: str
+    description: str
+    start: str
+    end: str
+    location: str
+    attendees: int
+    meeting_link: str
+
 def get_calendar_service(access_token: str):
-    """Create Calendar service with access token"""
-    credentials = Credentials(token=access_token)
-    return build('calendar', 'v3', credentials=credentials)
+    """Get cached Calendar service for access token"""
+    return get_service('calendar', 'v3', access_token)
 
 @router.get("/events")
 async def get_events(
@@ -23,9 +44,9 @@ async def get_events(
         service = get_calendar_service(access_token)
         
         # Calculate time range
-        now = datetime.utcnow()
-        time_min = now.isoformat() + 'Z'
-        time_max = (now + timedelta(days=days_ahead)).isoformat() + 'Z'
+        now = datetime.now(timezone.utc)
+        time_min = format_rfc3339(now)
+        time_max = format_rfc3339(now + timedelta(days=days_ahead))
         
         # Get events
         events_result = service.events().list(
@@ -39,30 +60,37 @@ async def get_events(
         
         events = events_result.get('items', [])
         processed_events = []
+        upcoming_today = []
+        today = now.date()
         
         for event in events:
             start = event['start'].get('dateTime', event['start'].get('date'))
             end = event['end'].get('dateTime', event['end'].get('date'))
             
-            processed_events.append({
-                'id': event['id'],
-                'summary': event.get('summary', 'No Title'),
-                'description': event.get('description', ''),
-                'start': start,
-                'end': end,
-                'location': event.get('location', ''),
-                'attendees': len(event.get('attendees', [])),
-                'meeting_link': extract_meeting_link(event.get('description', ''))
-            })
+            processed_event = EventRecord(
+                id=event['id'],
+                summary=event.get('summary', 'No Title'),
+                description=event.get('description', ''),
+                start=start,
+                end=end,
+                location=event.get('location', ''),
+                attendees=len(event.get('attendees', [])),
+                meeting_link=extract_meeting_link(event.get('description', ''))
+            )
+            processed_events.append(processed_event)
+            
+            if parse_event_date(start) == today:
+                upcoming_today.append(processed_event)
         
         # AI analysis
-        efficiency_analysis = ai_service.analyze_calendar_efficiency(processed_events)
+        efficiency_analysis = get_ai_service().analyze_calendar_efficiency(processed_events)
         
+        # FastAPI serializes the dataclass records field by field
         return {
             'events': processed_events,
             'total_events': len(processed_events),
             'efficiency_analysis': efficiency_analysis,
-            'upcoming_today': [e for e in processed_events if is_today(e['start'])]
+            'upcoming_today': upcoming_today
         }
         
     except Exception as e:
@@ -75,28 +103,30 @@ async def get_calendar_stats(authorization: str = Header(...)):
         access_token = authorization.replace("Bearer ", "")
         service = get_calendar_service(access_token)
         
-        # Get today's events
-        now = datetime.utcnow()
+        # Get today's range
+        now = datetime.now(timezone.utc)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         today_end = today_start + timedelta(days=1)
         
-        today_events = service.events().list(
-            calendarId='primary',
-            timeMin=today_start.isoformat() + 'Z',
-            timeMax=today_end.isoformat() + 'Z',
-            singleEvents=True
-        ).execute()
-        
-        # Get this week's events
+        # Get this week's range
         week_start = today_start - timedelta(days=today_start.weekday())
         week_end = week_start + timedelta(days=7)
         
-        week_events = service.events().list(
-            calendarId='primary',
-            timeMin=week_start.isoformat() + 'Z',
-            timeMax=week_end.isoformat() + 'Z',
-            singleEvents=True
-        ).execute()
+        # Fetch today's and this week's events concurrently
+        today_events, week_events = await asyncio.gather(
+            execute_async(service.events().list(
+                calendarId='primary',
+                timeMin=format_rfc3339(today_start),
+                timeMax=format_rfc3339(today_end),
+                singleEvents=True
+            )),
+            execute_async(service.events().list(
+                calendarId='primary',
+                timeMin=format_rfc3339(week_start),
+                timeMax=format_rfc3339(week_end),
+                singleEvents=True
+            ))
+        )
         
         today_count = len(today_events.get('items', []))
         week_count = len(week_events.get('items', []))
@@ -124,14 +154,14 @@ async def get_focus_time_suggestions(authorization: str = Header(...)):
         service = get_calendar_service(access_token)
         
         # Get today's events
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         today_end = today_start + timedelta(days=1)
         
         events = service.events().list(
             calendarId='primary',
-            timeMin=today_start.isoformat() + 'Z',
-            timeMax=today_end.isoformat() + 'Z',
+            timeMin=format_rfc3339(today_start),
+            timeMax=format_rfc3339(today_end),
             singleEvents=True,
             orderBy='startTime'
         ).execute()
@@ -165,33 +195,21 @@ async def get_focus_time_suggestions(authorization: str = Header(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate focus time suggestions: {str(e)}")
 
+def format_rfc3339(dt: datetime) -> str:
+    """Format a UTC datetime as the RFC 3339 timestamp the Calendar API expects"""
+    return dt.strftime(RFC3339_FORMAT)
+
 def extract_meeting_link(description: str) -> str:
     """Extract meeting link from event description"""
-    import re
-    
-    # Common meeting link patterns
-    patterns = [
-        r'https://[a-zA-Z0-9.-]+\.zoom\.us/[^\s]+',
-        r'https://meet\.google\.com/[^\s]+',
-        r'https://teams\.microsoft\.com/[^\s]+',
-        r'https://[a-zA-Z0-9.-]+\.webex\.com/[^\s]+'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, description)
-        if match:
-            return match.group(0)
-    
-    return ""
+    match = MEETING_LINK_RE.search(description)
+    return match.group(0) if match else ""
 
-def is_today(date_str: str) -> bool:
-    """Check if date string is today"""
+def parse_event_date(date_str: str) -> Optional[date]:
+    """Parse the calendar date of an event start, or None if it cannot be parsed"""
     try:
-        event_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        today = datetime.now().date()
-        return event_date.date() == today
-    except:
-        return False
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()
+    except (AttributeError, TypeError, ValueError):
+        return None
 
 def calculate_productivity_score(today_meetings: int, week_meetings: int) -> int:
     """Calculate a simple productivity score based on meeting load"""
@@ -1,15 +1,35 @@
 from fastapi import APIRouter, HTTPException, Header
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
-from services.ai_summary import ai_service
-from typing import List, Dict
+from services.ai_loader import get_ai_service
+from services.google_api import execute_async, execute_batch, get_service
+import asyncio
+import logging
+from collections import defaultdict
+from typing import List, Dict, Tuple
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 def get_drive_service(access_token: str):
-    """Create Drive service with access token"""
-    credentials = Credentials(token=access_token)
-    return build('drive', 'v3', credentials=credentials)
+    """Get cached Drive service for access token"""
+    return get_service('drive', 'v3', access_token)
+
+async def fetch_files_batch(service, file_ids: List[str]) -> Tuple[List[Dict], List[str]]:
+    """Fetch file metadata in batched HTTP requests, preserving input order.
+    
+    Returns the fetched files and the IDs of files whose sub-request failed.
+    """
+    # Batch request IDs must be unique, so duplicate IDs collapse into one request
+    requests = {
+        file_id: service.files().get(fileId=file_id, fields="id, name, mimeType")
+        for file_id in dict.fromkeys(file_ids)
+    }
+    fetched, errors = await execute_batch(service, requests)
+    
+    for file_id, error in errors.items():
+        logger.warning(f"Failed to fetch Drive file {file_id}: {error}")
+    
+    return [fetched[file_id] for file_id in requests if file_id in fetched], list(errors)
 
 @router.get("/files")
 async def get_files(
@@ -31,10 +51,10 @@ async def get_files(
         files = results.get('files', [])
         categorized_files = []
         
-        for file in files:
-            # AI categorization
-            category = ai_service.categorize_file(file['name'])
-            
+        # AI categorization for the whole listing in one call
+        file_categories = await get_ai_service().categorize_files_batch([file['name'] for file in files])
+        
+        for file, category in zip(files, file_categories):
             categorized_files.append({
                 'id': file['id'],
                 'name': file['name'],
@@ -46,16 +66,13 @@ async def get_files(
             })
         
         # Group by category
-        categories = {}
+        categories = defaultdict(list)
         for file in categorized_files:
-            cat = file['category']
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(file)
+            categories[file['category']].append(file)
         
         return {
             'files': categorized_files,
-            'categories': categories,
+            'categories': dict(categories),
             'total_count': len(categorized_files),
             'category_summary': {cat: len(files) for cat, files in categories.items()}
         }
@@ -70,16 +87,16 @@ async def get_drive_stats(authorization: str = Header(...)):
         access_token = authorization.replace("Bearer ", "")
         service = get_drive_service(access_token)
         
-        # Get storage info
-        about = service.about().get(fields="storageQuota, user").execute()
+        # Get storage info and recent files count concurrently
+        about, recent_files = await asyncio.gather(
+            execute_async(service.about().get(fields="storageQuota, user")),
+            execute_async(service.files().list(
+                q="modifiedTime > '2024-01-01T00:00:00'",
+                fields="files(id)"
+            ))
+        )
         storage_quota = about.get('storageQuota', {})
         
-        # Get recent files count
-        recent_files = service.files().list(
-            q="modifiedTime > '2024-01-01T00:00:00'",
-            fields="files(id)"
-        ).execute()
-        
         return {
             'storage_used': storage_quota.get('usage', 'Unknown'),
             'storage_limit': storage_quota.get('limit', 'Unknown'),
@@ -105,14 +122,15 @@ async def suggest_organization(
         service = get_drive_service(access_token)
         
         suggestions = []
+        failed_ids = []
         
         if file_ids:
-            for file_id in file_ids:
-                file = service.files().get(fileId=file_id, fields="name, mimeType").execute()
-                category = ai_service.categorize_file(file['name'])
+            files, failed_ids = await fetch_files_batch(service, file_ids)
+            for file in files:
+                category = get_ai_service().categorize_file(file['name'])
                 
                 suggestions.append({
-                    'file_id': file_id,
+                    'file_id': file['id'],
                     'file_name': file['name'],
                     'suggested_folder': category,
                     'reason': f"File appears to be a {category.lower()} based on name and type"
@@ -120,6 +138,7 @@ async def suggest_organization(
         
         return {
             'suggestions': suggestions,
+            'failed_count': len(failed_ids),
             'organization_tips': [
                 "Create folders for each category (Documents, Images, Spreadsheets)",
                 "Use consistent naming conventions",
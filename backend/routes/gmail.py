@@ -1,23 +1,89 @@
 from fastapi import APIRouter, HTTPException, Header
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
-from services.ai_summary import ai_service
+from fastapi.responses import StreamingResponse
+from services.ai_loader import get_ai_service
+from services.google_api import execute_async, execute_batch, get_service
+import asyncio
 import base64
-from typing import Optional, List, Dict
+import json
+import logging
+from typing import Optional, List, Dict, Tuple
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Messages fetched and summarized per streamed chunk
+STREAM_CHUNK_SIZE = 10
+
+# Partial response: only the headers and body parts get_messages reads,
+# nested three multipart levels deep
+MESSAGE_PART_FIELDS = 'mimeType,body/data'
+MESSAGE_FIELDS = (
+    'id,snippet,payload('
+    f'headers(name,value),{MESSAGE_PART_FIELDS},'
+    f'parts({MESSAGE_PART_FIELDS},parts({MESSAGE_PART_FIELDS},parts({MESSAGE_PART_FIELDS}))))'
+)
+
 def get_gmail_service(access_token: str):
-    """Create Gmail service with access token"""
-    credentials = Credentials(token=access_token)
-    return build('gmail', 'v1', credentials=credentials)
+    """Get cached Gmail service for access token"""
+    return get_service('gmail', 'v1', access_token)
+
+async def fetch_messages_batch(service, message_ids: List[str]) -> Tuple[List[Dict], List[str]]:
+    """Fetch full messages in batched HTTP requests, preserving input order.
+    
+    Returns the fetched messages and the IDs of messages whose sub-request failed.
+    """
+    requests = {
+        message_id: service.users().messages().get(
+            userId='me', id=message_id, format='full', fields=MESSAGE_FIELDS
+        )
+        for message_id in message_ids
+    }
+    fetched, errors = await execute_batch(service, requests)
+    
+    # One bad message should not fail the whole listing; skip it and report it
+    for message_id, error in errors.items():
+        logger.warning(f"Failed to fetch Gmail message {message_id}: {error}")
+    
+    return [fetched[message_id] for message_id in requests if message_id in fetched], list(errors)
+
+async def process_messages(service, message_ids: List[str], failed_ids: List[str]):
+    """Fetch, summarize and yield processed messages one chunk at a time.
+    
+    IDs of messages that could not be fetched are appended to failed_ids.
+    """
+    ai_service = get_ai_service()
+    
+    for offset in range(0, len(message_ids), STREAM_CHUNK_SIZE):
+        full_messages, failed = await fetch_messages_batch(
+            service, message_ids[offset:offset + STREAM_CHUNK_SIZE]
+        )
+        failed_ids.extend(failed)
+        
+        # Extract bodies first so AI summarization runs as one batch per chunk
+        bodies = [extract_message_body(message['payload']) for message in full_messages]
+        summaries = await ai_service.summarize_batch(bodies)
+        
+        for message, body, summary in zip(full_messages, bodies, summaries):
+            # Extract message data
+            headers = {h['name']: h['value'] for h in message['payload'].get('headers', [])}
+            
+            yield {
+                'id': message['id'],
+                'subject': headers.get('Subject', 'No Subject'),
+                'sender': headers.get('From', 'Unknown Sender'),
+                'date': headers.get('Date', ''),
+                'summary': summary.summary if body else "No content to summarize",
+                'tasks': ai_service.extract_tasks(body) if body else [],
+                'snippet': message.get('snippet', '')
+            }
 
 @router.get("/messages")
 async def get_messages(
     authorization: str = Header(...),
     max_results: int = 10
 ):
-    """Fetch recent Gmail messages with AI summaries"""
+    """Stream recent Gmail messages with AI summaries as they are processed"""
     try:
         # Extract token from Authorization header
         access_token = authorization.replace("Bearer ", "")
@@ -30,47 +96,32 @@ async def get_messages(
             q='is:unread OR newer_than:7d'  # Unread or from last 7 days
         ).execute()
         
-        messages = results.get('messages', [])
-        processed_messages = []
-        
-        for msg in messages:
-            # Get full message
-            message = service.users().messages().get(
-                userId='me',
-                id=msg['id'],
-                format='full'
-            ).execute()
-            
-            # Extract message data
-            headers = message['payload'].get('headers', [])
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown Sender')
-            date = next((h['value'] for h in headers if h['name'] == 'Date'), '')
-            
-            # Extract body
-            body = extract_message_body(message['payload'])
-            
-            # AI processing
-            summary = ai_service.summarize_text(body) if body else "No content to summarize"
-            tasks = ai_service.extract_tasks(body) if body else []
-            
-            processed_messages.append({
-                'id': msg['id'],
-                'subject': subject,
-                'sender': sender,
-                'date': date,
-                'summary': summary,
-                'tasks': tasks,
-                'snippet': message.get('snippet', '')
-            })
-        
-        return {
-            'messages': processed_messages,
-            'total_count': len(processed_messages)
-        }
+        message_ids = [msg['id'] for msg in results.get('messages', [])]
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch Gmail messages: {str(e)}")
+    
+    async def stream_messages():
+        # {"messages": [...], "total_count": N, "failed_count": M}; M > 0 means a partial listing
+        count = 0
+        failed_ids = []
+        error = None
+        yield '{"messages": ['
+        try:
+            async for item in process_messages(service, message_ids, failed_ids):
+                yield (', ' if count else '') + json.dumps(item)
+                count += 1
+        except Exception as e:
+            # Headers are already sent, so report the failure inside the body
+            logger.error(f"Failed while streaming Gmail messages: {e}")
+            error = f"Failed to fetch Gmail messages: {str(e)}"
+        
+        tail = f'], "total_count": {count}, "failed_count": {len(failed_ids)}'
+        if error:
+            tail += f', "error": {json.dumps(error)}'
+        yield tail + '}'
+    
+    return StreamingResponse(stream_messages(), media_type='application/json')
 
 @router.get("/stats")
 async def get_email_stats(authorization: str = Header(...)):
@@ -79,16 +130,11 @@ async def get_email_stats(authorization: str = Header(...)):
         access_token = authorization.replace("Bearer ", "")
         service = get_gmail_service(access_token)
         
-        # Get various email counts
-        unread_result = service.users().messages().list(
-            userId='me',
-            q='is:unread'
-        ).execute()
-        
-        today_result = service.users().messages().list(
-            userId='me',
-            q='newer_than:1d'
-        ).execute()
+        # Get various email counts concurrently
+        unread_result, today_result = await asyncio.gather(
+            execute_async(service.users().messages().list(userId='me', q='is:unread')),
+            execute_async(service.users().messages().list(userId='me', q='newer_than:1d'))
+        )
         
         return {
             'unread_count': unread_result.get('resultSizeEstimate', 0),
@@ -104,21 +150,26 @@ async def get_email_stats(authorization: str = Header(...)):
         raise HTTPException(status_code=500, detail=f"Failed to get email stats: {str(e)}")
 
 def extract_message_body(payload) -> str:
-    """Extract text body from Gmail message payload"""
-    body = ""
+    """Extract text body from Gmail message payload, preferring text/plain over HTML"""
+    html_data = None
     
-    if 'parts' in payload:
-        for part in payload['parts']:
-            if part['mimeType'] == 'text/plain':
-                data = part['body']['data']
-                body = base64.urlsafe_b64decode(data).decode('utf-8')
-                break
-            elif part['mimeType'] == 'text/html':
-                data = part['body']['data']
-                body = base64.urlsafe_b64decode(data).decode('utf-8')
-    else:
-        if payload['mimeType'] == 'text/plain':
-            data = payload['body']['data']
-            body = base64.urlsafe_b64decode(data).decode('utf-8')
+    # Walk nested multipart trees depth-first in document order
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        mime_type = part.get('mimeType', '')
+        data = part.get('body', {}).get('data')
+        
+        if data and mime_type == 'text/plain':
+            return decode_body_data(data)
+        if data and mime_type == 'text/html' and html_data is None:
+            html_data = data
+        
+        stack.extend(reversed(part.get('parts', [])))
     
-    return body
\ No newline at end of file
+    # Only decode the HTML body when no plain text alternative exists
+    return decode_body_data(html_data) if html_data else ""
+
+def decode_body_data(data: str) -> str:
+    """Decode a base64url-encoded Gmail body"""
+    return base64.urlsafe_b64decode(data).decode('utf-8', errors='replace')
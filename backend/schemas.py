@@ -1,23 +1,28 @@
 """
 Pydantic schemas for request/response validation
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, EmailStr, HttpUrl
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, PrivateAttr
+
+
+class DeferredModel(BaseModel):
+    """Base for schemas off the hot request path; their validators are built on first use"""
+    model_config = ConfigDict(defer_build=True)
 
 
 # Authentication Schemas
-class TokenResponse(BaseModel):
+class TokenResponse(DeferredModel):
     access_token: str
     refresh_token: Optional[str] = None
     token_type: str = "bearer"
     expires_in: int
 
 
-class UserInfo(BaseModel):
+class UserInfo(DeferredModel):
     email: EmailStr
     name: Optional[str] = None
-    picture: Optional[HttpUrl] = None
+    picture: Optional[str] = None
 
 
 # Gmail Schemas
@@ -39,7 +44,7 @@ class EmailMessage(BaseModel):
     is_unread: bool = False
 
 
-class EmailStats(BaseModel):
+class EmailStats(DeferredModel):
     unread_count: int
     today_count: int
     processed_today: int
@@ -47,7 +52,7 @@ class EmailStats(BaseModel):
     productivity_tips: List[str] = []
 
 
-class EmailSummaryResponse(BaseModel):
+class EmailSummaryResponse(DeferredModel):
     messages: List[EmailMessage]
     total_count: int
     stats: EmailStats
@@ -60,21 +65,21 @@ class DriveFile(BaseModel):
     mime_type: str
     size: Optional[str] = None
     modified_time: datetime
-    web_view_link: Optional[HttpUrl] = None
+    web_view_link: Optional[str] = None
     category: str
     confidence_score: Optional[float] = None
 
 
-class DriveStats(BaseModel):
+class DriveStats(DeferredModel):
     storage_used: str
     storage_limit: str
     recent_files_count: int
-    user_email: EmailStr
+    user_email: str
     insights: List[str] = []
     organization_score: Optional[int] = None
 
 
-class DriveResponse(BaseModel):
+class DriveResponse(DeferredModel):
     files: List[DriveFile]
     categories: Dict[str, List[DriveFile]]
     total_count: int
@@ -91,11 +96,11 @@ class CalendarEvent(BaseModel):
     end: str
     location: Optional[str] = None
     attendees: int = 0
-    meeting_link: Optional[HttpUrl] = None
+    meeting_link: Optional[str] = None
     event_type: Optional[str] = None  # meeting, focus, break
 
 
-class FocusBlock(BaseModel):
+class FocusBlock(DeferredModel):
     start: str
     end: str
     duration_hours: float
@@ -103,7 +108,7 @@ class FocusBlock(BaseModel):
     block_type: str = "focus"
 
 
-class CalendarStats(BaseModel):
+class CalendarStats(DeferredModel):
     today_meetings: int
     week_meetings: int
     average_daily_meetings: float
@@ -112,7 +117,7 @@ class CalendarStats(BaseModel):
     focus_time_available: float = 0.0
 
 
-class CalendarResponse(BaseModel):
+class CalendarResponse(DeferredModel):
     events: List[CalendarEvent]
     total_events: int
     upcoming_today: List[CalendarEvent]
@@ -121,7 +126,7 @@ class CalendarResponse(BaseModel):
 
 
 # Dashboard Schemas
-class DashboardStats(BaseModel):
+class DashboardStats(DeferredModel):
     emails: EmailStats
     drive: DriveStats
     calendar: CalendarStats
@@ -131,7 +136,7 @@ class DashboardStats(BaseModel):
 
 
 # AI Processing Schemas
-class SummarizationRequest(BaseModel):
+class SummarizationRequest(DeferredModel):
     text: str
     max_length: int = 150
     min_length: int = 30
@@ -143,44 +148,57 @@ class SummarizationResponse(BaseModel):
     processing_time: float
 
 
-class TaskExtractionRequest(BaseModel):
+class TaskExtractionRequest(DeferredModel):
     text: str
     max_tasks: int = 5
 
 
-class TaskExtractionResponse(BaseModel):
+class TaskExtractionResponse(DeferredModel):
     tasks: List[EmailTask]
     confidence_scores: List[float]
     processing_time: float
 
 
 # Error Schemas
-class ErrorResponse(BaseModel):
+class ErrorResponse(DeferredModel):
     error: str
     message: str
     details: Optional[Dict[str, Any]] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 # Health Check Schema
 class HealthCheck(BaseModel):
     status: str = "healthy"
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     version: str = "1.0.0"
-    services: Dict[str, str] = {}
+    services: Dict[str, str] = Field(default_factory=dict)
 
 
 # Pagination Schema
-class PaginationParams(BaseModel):
+class PaginationParams(DeferredModel):
+    # Frozen so the precomputed offset can never drift from page and size
+    model_config = ConfigDict(frozen=True)
+    
     page: int = 1
     size: int = 20
+    _offset: int = PrivateAttr(default=0)
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._offset = (self.page - 1) * self.size
     
     @property
     def offset(self) -> int:
-        return (self.page - 1) * self.size
+        return self._offset
+    
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "PaginationParams":
+        # model_copy skips validation and model_post_init, so recompute the offset here
+        copy = super().model_copy(update=update, deep=deep)
+        copy.model_post_init(None)
+        return copy
 
 
-class PaginatedResponse(BaseModel):
+class PaginatedResponse(DeferredModel):
     items: List[Any]
     total: int
     page: int
@@ -0,0 +1,9 @@
+"""
+Lazy access to the AI service, so importing a router does not load ML libraries
+"""
+
+
+def get_ai_service():
+    """Import the AI service on first use so loading the caller stays cheap"""
+    from services.ai_summary import ai_service
+    return ai_service
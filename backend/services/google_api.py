@@ -0,0 +1,84 @@
+"""
+Shared helpers for calling Google APIs from async route handlers
+"""
+import asyncio
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+import httplib2
+from cachetools import TTLCache
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+# Google batch endpoints accept at most 100 sub-requests per call
+BATCH_LIMIT = 100
+
+# Built service objects, keyed by API, version and a hash of the access token
+_service_cache = TTLCache(maxsize=1024, ttl=600)
+
+
+@lru_cache(maxsize=None)
+def get_discovery_document(api: str, version: str) -> str:
+    """Read the discovery document bundled with google-api-python-client once"""
+    document = get_static_doc(api, version)
+    if document is None:
+        raise ValueError(f"No bundled discovery document for {api} {version}")
+    return document
+
+
+def get_service(api: str, version: str, access_token: str):
+    """Return a cached Google API service object for the given access token"""
+    key = (api, version, hashlib.sha256(access_token.encode()).hexdigest())
+    service = _service_cache.get(key)
+    if service is None:
+        credentials = Credentials(token=access_token)
+        service = build_from_document(
+            get_discovery_document(api, version), credentials=credentials
+        )
+        _service_cache[key] = service
+    return service
+
+
+def new_http(credentials) -> AuthorizedHttp:
+    """Build a fresh authorized HTTP object for use from a single thread"""
+    return AuthorizedHttp(credentials, http=httplib2.Http())
+
+
+async def execute_async(request):
+    """Execute a Google API request in a worker thread without blocking the event loop.
+
+    httplib2 connections are not thread-safe and service objects are shared
+    between requests, so each call gets its own authorized HTTP object.
+    """
+    http = new_http(request.http.credentials)
+    return await asyncio.to_thread(request.execute, http=http)
+
+
+async def execute_batch(
+    service, requests_by_id: Dict[str, Any], limit: int = BATCH_LIMIT
+) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """Execute requests as batch HTTP calls of up to limit sub-requests each.
+
+    Returns the responses and the errors of failed sub-requests, both keyed
+    by request ID; one failed sub-request does not fail the others.
+    """
+    responses = {}
+    errors = {}
+
+    def _collect(request_id, response, exception):
+        if exception is None:
+            responses[request_id] = response
+        else:
+            errors[request_id] = exception
+
+    items = list(requests_by_id.items())
+    for offset in range(0, len(items), limit):
+        batch = service.new_batch_http_request(callback=_collect)
+        for request_id, request in items[offset:offset + limit]:
+            batch.add(request, request_id=request_id)
+        await asyncio.to_thread(batch.execute, http=new_http(request.http.credentials))
+
+    return responses, errors
@@ -24,20 +24,25 @@ SCOPES = [
     'profile'
 ]
 
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+_CLIENT_CONFIG = {
+    "web": {
+        "client_id": GOOGLE_CLIENT_ID,
+        "client_secret": GOOGLE_CLIENT_SECRET,
+        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": TOKEN_URI,
+        "redirect_uris": [GOOGLE_REDIRECT_URI]
+    }
+}
+
+# Shared transport so token refreshes reuse one HTTP session and connection pool
+_auth_request = Request()
+
 def create_flow():
     """Create OAuth flow for Google authentication"""
-    flow = Flow.from_client_config(
-        {
-            "web": {
-                "client_id": GOOGLE_CLIENT_ID,
-                "client_secret": GOOGLE_CLIENT_SECRET,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "redirect_uris": [GOOGLE_REDIRECT_URI]
-            }
-        },
-        scopes=SCOPES
-    )
+    # A Flow holds per-login state (PKCE verifier, fetched credentials), so only the config is shared
+    flow = Flow.from_client_config(_CLIENT_CONFIG, scopes=SCOPES)
     flow.redirect_uri = GOOGLE_REDIRECT_URI
     return flow
 
@@ -84,12 +89,12 @@ async def refresh_token(refresh_token: str):
         credentials = Credentials(
             token=None,
             refresh_token=refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
+            token_uri=TOKEN_URI,
             client_id=GOOGLE_CLIENT_ID,
             client_secret=GOOGLE_CLIENT_SECRET
         )
         
-        credentials.refresh(Request())
+        credentials.refresh(_auth_request)
         
         return {
             "access_token": credentials.token,
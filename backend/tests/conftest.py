@@ -0,0 +1,10 @@
+"""
+Shared test configuration
+"""
+import os
+
+# Settings are read at import time by several modules; give the required
+# fields placeholder values when no .env is present
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test-client-id")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-client-secret")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
@@ -0,0 +1,324 @@
+"""
+Tests for the AI summary service
+"""
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+import services.ai_summary
+from routes.calendar import EventRecord
+from services.ai_summary import AISummaryService, SummaryCache, CATEGORY_PROTOTYPES
+
+
+# Text and the tasks the original per-pattern regex extraction returned for it
+TASK_CASES = [
+    ("Please send the quarterly report by Friday.",
+     ['send the quarterly report by Friday']),
+    # Case variants, and a second trigger inside an earlier clause
+    ("PLEASE Review The Budget Draft! Can you book a meeting room for Tuesday?",
+     ['Review The Budget Draft', 'book a meeting room for Tuesday',
+      'a meeting room for Tuesday', 'The Budget Draft']),
+    ("Action item: update the onboarding docs. TODO: clean up the repo tonight.",
+     ['update the onboarding docs', 'clean up the repo tonight', 'the onboarding docs']),
+    # Overlapping keywords: "should" then "schedule", "please" then "confirm"
+    ("We should schedule a kickoff with the vendor team.",
+     ['schedule a kickoff with the vendor team', 'a kickoff with the vendor team']),
+    ("Could you please confirm the venue and the caterer?",
+     ['please confirm the venue and the caterer', 'the venue and the caterer']),
+    ("You must review and update the security policy before Thursday.",
+     ['review and update the security policy before Thursday', 'before Thursday',
+      'and update the security policy before Thursday']),
+    # Triggers also match inside words, as the regexes did
+    ("The Facebook team wants feedback.", ['team wants feedback']),
+    ("Please submit the form before Monday afternoon at the latest.",
+     ['submit the form before Monday afternoon at the latest',
+      'before Monday afternoon at the latest']),
+    ("Nothing to do here. Thanks!", []),
+]
+
+
+class TestExtractTasks:
+    """Test task extraction matches the original regex output"""
+    
+    @pytest.mark.parametrize("text, expected", TASK_CASES)
+    def test_extract_tasks(self, text, expected):
+        """Test tasks found with the trigger automaton (or regexes without it)"""
+        assert AISummaryService().extract_tasks(text) == expected
+    
+    @pytest.mark.parametrize("text, expected", TASK_CASES)
+    def test_regex_fallback(self, text, expected, monkeypatch):
+        """Test the regex fallback returns the same tasks"""
+        monkeypatch.setattr(services.ai_summary, 'TRIGGER_AUTOMATON', None)
+        assert AISummaryService().extract_tasks(text) == expected
+    
+    def test_returns_at_most_five_tasks(self):
+        """Test long texts are capped to the first five tasks"""
+        text = " ".join(f"Please handle item number {i} today." for i in range(10))
+        assert AISummaryService().extract_tasks(text) == [
+            f"handle item number {i} today" for i in range(5)
+        ]
+
+
+class TestCategorizeFile:
+    """Test rule-based file categorization"""
+    
+    @pytest.mark.parametrize("filename, category", [
+        ("notes.pdf", "Document"),
+        ("notes.doc", "Document"),
+        ("notes.docx", "Document"),
+        ("photo.jpg", "Image"),
+        ("photo.jpeg", "Image"),
+        ("photo.png", "Image"),
+        ("photo.gif", "Image"),
+        ("budget.xlsx", "Spreadsheet"),
+        ("budget.xls", "Spreadsheet"),
+        ("budget.csv", "Spreadsheet"),
+        ("deck.ppt", "Presentation"),
+        ("deck.pptx", "Presentation"),
+        ("archive.zip", "Other"),
+        ("README", "Other"),
+    ])
+    def test_extensions(self, filename, category):
+        """Test each known extension maps to its category"""
+        assert AISummaryService().categorize_file(filename) == category
+    
+    @pytest.mark.parametrize("filename, category", [
+        ("resume.pdf", "Resume/CV"),
+        ("Jane_CV.docx", "Resume/CV"),
+        ("q3_report.doc", "Report"),
+        ("market-analysis.pdf", "Report"),
+        ("contract.docx", "Legal Document"),
+        ("NDA Agreement.PDF", "Legal Document"),
+        # Earlier keywords win, as in the original if/elif chain
+        ("resume_report.pdf", "Resume/CV"),
+        ("analysis_contract.pdf", "Report"),
+    ])
+    def test_document_keywords(self, filename, category):
+        """Test document keywords refine the Document category"""
+        assert AISummaryService().categorize_file(filename) == category
+    
+    def test_keywords_only_refine_documents(self):
+        """Test keywords in non-document names leave the extension category"""
+        service = AISummaryService()
+        assert service.categorize_file("report_chart.png") == "Image"
+        assert service.categorize_file("contract_terms.xlsx") == "Spreadsheet"
+        assert service.categorize_file("resume.txt") == "Other"
+    
+    def test_only_the_final_extension_counts(self):
+        """Test an extension in the middle of a name is ignored"""
+        service = AISummaryService()
+        assert service.categorize_file("scan.pdf.png") == "Image"
+        assert service.categorize_file("my.docs.txt") == "Other"
+
+
+def unit_vector(similarity: float) -> np.ndarray:
+    """Unit vector whose dot product with [1, 0] is the given similarity"""
+    return np.array([similarity, np.sqrt(1 - similarity ** 2)])
+
+
+class TestSummaryCache:
+    """Test the exact and semantic summary cache tiers"""
+    
+    def test_exact_hit(self):
+        """Test identical text and length return the stored summary"""
+        cache = SummaryCache()
+        key = SummaryCache.key("Quarterly numbers are up.", 150)
+        cache.put(key, None, 150, ("Numbers up.", 0.9))
+        
+        assert cache.get_exact(SummaryCache.key("Quarterly numbers are up.", 150)) == ("Numbers up.", 0.9)
+        assert cache.get_exact(SummaryCache.key("Quarterly numbers are up!", 150)) is None
+        assert cache.get_exact(SummaryCache.key("Quarterly numbers are up.", 100)) is None
+    
+    def test_exact_entries_are_evicted_least_recently_used(self):
+        """Test the exact tier drops the least recently used key when full"""
+        cache = SummaryCache(max_entries=2)
+        keys = [SummaryCache.key(text, 150) for text in ("a", "b", "c")]
+        cache.put(keys[0], None, 150, ("A", 0.9))
+        cache.put(keys[1], None, 150, ("B", 0.9))
+        cache.get_exact(keys[0])
+        cache.put(keys[2], None, 150, ("C", 0.9))
+        
+        assert cache.get_exact(keys[0]) == ("A", 0.9)
+        assert cache.get_exact(keys[1]) is None
+        assert cache.get_exact(keys[2]) == ("C", 0.9)
+    
+    def test_similar_hit_at_threshold(self):
+        """Test a near-duplicate at exactly the threshold reuses the summary"""
+        cache = SummaryCache(threshold=0.95)
+        cache.put(b"key", np.array([1.0, 0.0]), 150, ("Summary", 0.8))
+        
+        assert cache.get_similar(unit_vector(0.95), 150) == ("Summary", 0.8)
+    
+    def test_similar_miss_below_threshold(self):
+        """Test a text just below the threshold does not reuse the summary"""
+        cache = SummaryCache(threshold=0.95)
+        cache.put(b"key", np.array([1.0, 0.0]), 150, ("Summary", 0.8))
+        
+        assert cache.get_similar(unit_vector(0.949), 150) is None
+    
+    def test_similar_requires_same_length(self):
+        """Test a summary made for another max_length is not reused"""
+        cache = SummaryCache()
+        cache.put(b"key", np.array([1.0, 0.0], dtype=np.float32), 150, ("Summary", 0.8))
+        
+        assert cache.get_similar(np.array([1.0, 0.0], dtype=np.float32), 100) is None
+    
+    def test_similar_on_empty_cache(self):
+        """Test lookups before any embedding is stored"""
+        assert SummaryCache().get_similar(np.array([1.0, 0.0], dtype=np.float32), 150) is None
+    
+    def test_ring_buffer_evicts_oldest_embedding(self):
+        """Test the semantic tier overwrites its oldest row when full"""
+        cache = SummaryCache(semantic_entries=2)
+        vectors = np.eye(3, dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            cache.put(bytes([i]), vector, 150, (f"Summary {i}", 0.8))
+        
+        assert cache.get_similar(vectors[0], 150) is None
+        assert cache.get_similar(vectors[1], 150) == ("Summary 1", 0.8)
+        assert cache.get_similar(vectors[2], 150) == ("Summary 2", 0.8)
+        
+        # The overwritten row's exact entry is still served by the exact tier
+        assert cache.get_exact(bytes([0])) == ("Summary 0", 0.8)
+
+
+class FakeEncoder:
+    """Stands in for the SentenceTransformer, mapping texts to fixed unit vectors"""
+    
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.threads = []
+    
+    def encode(self, texts, **kwargs):
+        self.threads.append(threading.current_thread().name)
+        return np.array([self.vectors[text] for text in texts], dtype=np.float32)
+
+
+class TestCategorizeFilesBatch:
+    """Test batch categorization with the embedding fallback"""
+    
+    def test_unmatched_names_are_embedded_off_the_event_loop(self):
+        """Test names the rules miss are matched to prototypes in ml_executor"""
+        labels = list(CATEGORY_PROTOTYPES)
+        vectors = {
+            description: np.eye(len(labels))[i]
+            for i, description in enumerate(CATEGORY_PROTOTYPES.values())
+        }
+        vectors['holiday_pics'] = np.eye(len(labels))[labels.index('Image')]
+        vectors['notes.xyz'] = np.zeros(len(labels))
+        
+        service = AISummaryService()
+        service.classifier = FakeEncoder(vectors)
+        
+        categories = asyncio.run(
+            service.categorize_files_batch(['report.pdf', 'holiday_pics', 'notes.xyz'])
+        )
+        
+        assert categories == ['Report', 'Image', 'Other']
+        assert service.classifier.threads
+        assert all(name.startswith('ml_worker') for name in service.classifier.threads)
+    
+    def test_without_classifier_uses_rules_only(self):
+        """Test the rule-based categories are returned when no model is loaded"""
+        service = AISummaryService()
+        assert asyncio.run(service.categorize_files_batch(['a.png', 'b'])) == ['Image', 'Other']
+
+
+def event(start: str, end: str) -> EventRecord:
+    """Build an event record with only the times filled in"""
+    return EventRecord(
+        id='', summary='', description='', start=start, end=end,
+        location='', attendees=0, meeting_link=''
+    )
+
+
+class TestAnalyzeCalendarEfficiency:
+    """Test meeting hours and back-to-back detection"""
+    
+    def test_no_events(self):
+        """Test an empty calendar"""
+        assert AISummaryService().analyze_calendar_efficiency([]) == {
+            "total_meetings": 0, "suggestions": []
+        }
+    
+    def test_back_to_back_meetings(self):
+        """Test gaps under 15 minutes, including overlaps, count as back-to-back"""
+        events = [
+            # Given out of order; gaps are measured in start order
+            event('2024-05-01T11:00:00Z', '2024-05-01T11:30:00Z'),
+            event('2024-05-01T09:00:00Z', '2024-05-01T10:00:00Z'),
+            event('2024-05-01T10:10:00Z', '2024-05-01T11:05:00Z'),  # 10 min gap, then overlap
+            event('2024-05-01T13:00:00Z', '2024-05-01T13:30:00Z'),  # 90 min gap
+        ]
+        result = AISummaryService().analyze_calendar_efficiency(events)
+        
+        assert result["total_meetings"] == 4
+        assert result["estimated_meeting_hours"] == round(1 + 55 / 60 + 0.5 + 0.5, 2)
+        assert result["back_to_back_meetings"] == 2
+        assert result["suggestions"] == [
+            "Back-to-back meetings detected (2 with under 15 minutes between them) - consider adding buffers"
+        ]
+    
+    def test_fifteen_minute_gap_is_not_back_to_back(self):
+        """Test a gap of exactly 15 minutes is enough of a buffer"""
+        events = [
+            event('2024-05-01T09:00:00Z', '2024-05-01T09:45:00Z'),
+            event('2024-05-01T10:00:00Z', '2024-05-01T10:30:00Z'),
+        ]
+        result = AISummaryService().analyze_calendar_efficiency(events)
+        
+        assert result["back_to_back_meetings"] == 0
+        assert result["suggestions"] == []
+    
+    def test_all_day_events_count_as_one_hour(self):
+        """Test all-day date events add an hour each and never count as back-to-back"""
+        events = [
+            event('2024-05-01', '2024-05-02'),
+            event('2024-05-01', '2024-05-03'),
+            event('2024-05-01T09:00:00Z', '2024-05-01T09:30:00Z'),
+        ]
+        result = AISummaryService().analyze_calendar_efficiency(events)
+        
+        assert result["total_meetings"] == 3
+        assert result["estimated_meeting_hours"] == 2.5
+        assert result["back_to_back_meetings"] == 0
+    
+    def test_mixed_utc_and_offset_timestamps(self):
+        """Test Z and offset timestamps are compared on the same UTC clock"""
+        events = [
+            event('2024-05-01T09:00:00Z', '2024-05-01T10:00:00Z'),
+            # 10:05-11:35 UTC, written in US Eastern and Central European summer time
+            event('2024-05-01T06:05:00-04:00', '2024-05-01T13:35:00+02:00'),
+        ]
+        result = AISummaryService().analyze_calendar_efficiency(events)
+        
+        assert result["estimated_meeting_hours"] == 2.5
+        assert result["back_to_back_meetings"] == 1
+    
+    def test_invalid_spans_fall_back_to_one_hour(self):
+        """Test unparseable or non-positive spans are treated like all-day events"""
+        events = [
+            event('not a time', '2024-05-01T10:00:00Z'),
+            event('2024-05-01T10:00:00Z', '2024-05-01T09:00:00Z'),
+        ]
+        result = AISummaryService().analyze_calendar_efficiency(events)
+        
+        assert result["estimated_meeting_hours"] == 2.0
+        assert result["back_to_back_meetings"] == 0
+    
+    def test_long_and_dense_days_are_flagged(self):
+        """Test the meeting time and density suggestions"""
+        events = [
+            event(f'2024-05-01T{hour:02d}:00:00Z', f'2024-05-01T{hour:02d}:45:00Z')
+            for hour in range(8, 17)
+        ]
+        result = AISummaryService().analyze_calendar_efficiency(events)
+        
+        assert result["estimated_meeting_hours"] == 6.75
+        assert result["back_to_back_meetings"] == 0
+        assert result["suggestions"] == [
+            "Consider reducing meeting time - you have over 6 hours of meetings",
+            "High meeting density - consider batching similar meetings",
+        ]
@@ -0,0 +1,83 @@
+"""
+Tests for Gmail message body extraction
+"""
+import base64
+
+from routes.gmail import extract_message_body
+
+
+def encode(text: str) -> str:
+    """Encode text the way the Gmail API returns body data"""
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+class TestExtractMessageBody:
+    """Test walking Gmail payloads for a readable body"""
+    
+    def test_single_part_plain_text(self):
+        """Test a non-multipart message"""
+        payload = {'mimeType': 'text/plain', 'body': {'data': encode("Hello there")}}
+        assert extract_message_body(payload) == "Hello there"
+    
+    def test_nested_multipart_alternative_prefers_plain_text(self):
+        """Test plain text is found inside a nested multipart/alternative"""
+        payload = {
+            'mimeType': 'multipart/mixed',
+            'body': {},
+            'parts': [
+                {
+                    'mimeType': 'multipart/alternative',
+                    'body': {},
+                    'parts': [
+                        {'mimeType': 'text/html', 'body': {'data': encode("<p>Agenda attached</p>")}},
+                        {'mimeType': 'text/plain', 'body': {'data': encode("Agenda attached")}},
+                    ]
+                },
+                {'mimeType': 'application/pdf', 'body': {}},
+            ]
+        }
+        assert extract_message_body(payload) == "Agenda attached"
+    
+    def test_first_plain_part_in_document_order(self):
+        """Test the earliest plain text part wins over later ones"""
+        payload = {
+            'mimeType': 'multipart/mixed',
+            'parts': [
+                {'mimeType': 'multipart/alternative', 'parts': [
+                    {'mimeType': 'text/plain', 'body': {'data': encode("First")}},
+                ]},
+                {'mimeType': 'text/plain', 'body': {'data': encode("Second")}},
+            ]
+        }
+        assert extract_message_body(payload) == "First"
+    
+    def test_html_only_message(self):
+        """Test the HTML body is used when there is no plain text part"""
+        payload = {
+            'mimeType': 'multipart/alternative',
+            'parts': [
+                {'mimeType': 'text/html', 'body': {'data': encode("<b>Only HTML</b>")}},
+            ]
+        }
+        assert extract_message_body(payload) == "<b>Only HTML</b>"
+    
+    def test_missing_data_field(self):
+        """Test parts without body data are skipped"""
+        payload = {
+            'mimeType': 'multipart/alternative',
+            'parts': [
+                {'mimeType': 'text/plain', 'body': {'size': 0}},
+                {'mimeType': 'text/html'},
+            ]
+        }
+        assert extract_message_body(payload) == ""
+        
+        # A later part with data is still found
+        payload['parts'].append({'mimeType': 'text/plain', 'body': {'data': encode("Late body")}})
+        assert extract_message_body(payload) == "Late body"
+    
+    def test_invalid_utf8_is_replaced(self):
+        """Test undecodable bytes do not raise"""
+        data = base64.urlsafe_b64encode(b"caf\xe9").decode()
+        payload = {'mimeType': 'text/plain', 'body': {'data': data}}
+        assert extract_message_body(payload) == "caf\ufffd"
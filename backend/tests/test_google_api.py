@@ -0,0 +1,63 @@
+"""
+Tests for the shared Google API helpers
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import services.google_api
+from services.google_api import execute_batch
+
+
+class FakeBatch:
+    """Stands in for BatchHttpRequest, answering each sub-request in order"""
+    
+    def __init__(self, callback, executed):
+        self.callback = callback
+        self.executed = executed
+        self.request_ids = []
+    
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+    
+    def execute(self, http=None):
+        self.executed.append(list(self.request_ids))
+        for request_id in self.request_ids:
+            if request_id.startswith('bad'):
+                self.callback(request_id, None, ValueError(request_id))
+            else:
+                self.callback(request_id, {'id': request_id}, None)
+
+
+class TestExecuteBatch:
+    """Test batched execution of Google API requests"""
+    
+    def execute(self, request_ids, limit):
+        """Run execute_batch against a fake service; returns the call log too"""
+        executed = []
+        service = MagicMock()
+        service.new_batch_http_request = lambda callback: FakeBatch(callback, executed)
+        requests = {request_id: MagicMock() for request_id in request_ids}
+        
+        with patch.object(services.google_api, 'new_http', lambda credentials: None):
+            responses, errors = asyncio.run(execute_batch(service, requests, limit=limit))
+        return responses, errors, executed
+    
+    def test_requests_are_split_into_batches(self):
+        """Test no batch call exceeds the sub-request limit"""
+        responses, errors, executed = self.execute([f'id{i}' for i in range(5)], limit=2)
+        
+        assert executed == [['id0', 'id1'], ['id2', 'id3'], ['id4']]
+        assert responses == {f'id{i}': {'id': f'id{i}'} for i in range(5)}
+        assert errors == {}
+    
+    def test_failed_sub_requests_are_reported(self):
+        """Test failures are returned by ID without dropping other responses"""
+        responses, errors, _ = self.execute(['a', 'bad1', 'b'], limit=100)
+        
+        assert set(responses) == {'a', 'b'}
+        assert list(errors) == ['bad1']
+        assert isinstance(errors['bad1'], ValueError)
+    
+    def test_no_requests(self):
+        """Test an empty batch makes no calls"""
+        assert self.execute([], limit=100) == ({}, {}, [])
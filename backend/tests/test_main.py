@@ -1,12 +1,15 @@
 """
 Tests for main FastAPI application
 """
+import importlib
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
+import main
 from main import app
-from config import settings
+from config import settings, get_settings
 
 
 @pytest.fixture
@@ -15,6 +18,21 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def production_client(monkeypatch):
+    """Test client for the app as assembled with ENVIRONMENT=production"""
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    get_settings.cache_clear()
+    production_app = importlib.reload(main).app
+    
+    # TrustedHostMiddleware only admits the configured hosts
+    yield TestClient(production_app, base_url="http://localhost")
+    
+    monkeypatch.undo()
+    get_settings.cache_clear()
+    importlib.reload(main)
+
+
 def test_root_endpoint(client):
     """Test root endpoint"""
     response = client.get("/")
@@ -40,6 +58,26 @@ def test_cors_headers(client):
     assert response.status_code == 200
 
 
+def test_cors_headers_on_health(client):
+    """Test health responses still pass through CORS"""
+    response = client.get("/health", headers={"Origin": "http://localhost:3000"})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+
+
+def test_head_health_is_handled(client):
+    """Test HEAD on a GET-only route is a 405, not a server error"""
+    response = client.head("/health")
+    assert response.status_code == 405
+
+
+def test_docs_disabled_in_production(production_client):
+    """Test the disabled docs paths are plain 404s in production"""
+    for path in ("/docs", "/redoc"):
+        assert production_client.get(path).status_code == 404
+    assert production_client.get("/health").status_code == 200
+
+
 def test_rate_limiting(client):
     """Test rate limiting middleware"""
     # This would need more sophisticated testing in a real scenario
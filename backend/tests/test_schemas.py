@@ -0,0 +1,36 @@
+"""
+Tests for API schemas
+"""
+import pytest
+from pydantic import ValidationError
+
+from schemas import PaginationParams
+
+
+class TestPaginationParams:
+    """Test the precomputed pagination offset"""
+    
+    def test_offset(self):
+        """Test offset is derived from page and size"""
+        assert PaginationParams().offset == 0
+        assert PaginationParams(page=3, size=10).offset == 20
+    
+    def test_page_and_size_are_frozen(self):
+        """Test the offset cannot go stale through assignment"""
+        params = PaginationParams(page=3, size=10)
+        with pytest.raises(ValidationError):
+            params.page = 4
+        assert params.offset == 20
+    
+    def test_copy_recomputes_offset(self):
+        """Test a copy with a new page gets its own offset"""
+        params = PaginationParams(page=3, size=10)
+        assert params.model_copy(update={'page': 5}).offset == 40
+        assert params.model_copy(update={'size': 25}).offset == 50
+        assert params.offset == 20
+    
+    def test_offset_is_not_an_input(self):
+        """Test offset is neither accepted from input nor part of the schema"""
+        assert PaginationParams(page=2, size=5, offset=99).offset == 5
+        assert 'offset' not in PaginationParams.model_json_schema()['properties']
+        assert PaginationParams(page=2).model_dump() == {'page': 2, 'size': 20}
@@ -1,13 +1,19 @@
 """
 Tests for utility functions
 """
+import asyncio
+import threading
+import time
 import pytest
+import numpy as np
 from datetime import datetime
 
 from utils import (
     clean_text, extract_email_addresses, extract_phone_numbers,
     format_file_size, calculate_text_similarity, validate_email,
-    sanitize_filename, is_business_hours, calculate_productivity_score
+    sanitize_filename, is_business_hours, calculate_productivity_score,
+    calculate_productivity_score_batch, parse_datetime, retry_with_backoff, jaccard_matrix,
+    RateLimiter, RedisRateLimiter
 )
 
 
@@ -39,6 +45,7 @@ class TestTextProcessing:
         text = "Call us at (555) 123-4567 or 555.987.6543"
         phones = extract_phone_numbers(text)
         assert len(phones) >= 1
+        assert phones == ["(555) 123-4567", "555.987.6543"]
     
     def test_calculate_text_similarity(self):
         """Test text similarity calculation"""
@@ -52,6 +59,58 @@ class TestTextProcessing:
         
         # Empty texts
         assert calculate_text_similarity("", "") == 0.0
+    
+    def test_text_similarity_across_vocabulary_resets(self, monkeypatch):
+        """Test threads racing vocabulary resets still get exact scores"""
+        import sys
+        import utils
+        
+        # A tiny vocabulary resets constantly; frequent thread switches expose races
+        monkeypatch.setattr(utils, 'WORD_VOCAB_LIMIT', 16)
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        
+        pairs = [
+            (f"alpha beta w{i} x{i}", f"beta gamma w{i} y{i}") for i in range(40)
+        ]
+        expected = [
+            len(set(a.split()) & set(b.split())) / len(set(a.split()) | set(b.split()))
+            for a, b in pairs
+        ]
+        wrong = []
+        
+        def worker():
+            for _ in range(50):
+                for (text1, text2), score in zip(pairs, expected):
+                    if calculate_text_similarity(text1, text2) != score:
+                        wrong.append((text1, text2))
+        
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        
+        assert wrong == []
+    
+    def test_jaccard_matrix(self):
+        """Test the pairwise matrix matches calculate_text_similarity"""
+        texts = ["hello world", "hello universe", "", "World of hello"]
+        matrix = jaccard_matrix(texts)
+        expected = [[calculate_text_similarity(a, b) for b in texts] for a in texts]
+        assert np.allclose(matrix, expected)
+    
+    def test_jaccard_matrix_without_numba(self, monkeypatch):
+        """Test the pure Python kernel gives the same matrix"""
+        import utils
+        
+        texts = ["hello world", "hello universe", "", "World of hello"]
+        expected = jaccard_matrix(texts)
+        monkeypatch.setattr(utils, '_get_jaccard_kernel', lambda: utils._make_jaccard_kernel(range))
+        assert np.allclose(jaccard_matrix(texts), expected)
 
 
 class TestFileUtils:
@@ -63,6 +122,16 @@ class TestFileUtils:
         assert format_file_size(1024) == "1.0 KB"
         assert format_file_size(1024 * 1024) == "1.0 MB"
         assert format_file_size(1024 * 1024 * 1024) == "1.0 GB"
+        
+        # Unit boundaries picked from the bit length
+        assert format_file_size(1023) == "1023.0 B"
+        assert format_file_size(1536) == "1.5 KB"
+        assert format_file_size(5 * 1024 ** 4) == "5.0 TB"
+        assert format_file_size(2048 * 1024 ** 4) == "2048.0 TB"
+        
+        # Fractional sizes, including under one byte
+        assert format_file_size(0.5) == "0.5 B"
+        assert format_file_size(1536.0) == "1.5 KB"
     
     def test_sanitize_filename(self):
         """Test filename sanitization"""
@@ -101,6 +170,18 @@ class TestValidation:
         # Monday 8 PM
         monday_8pm = datetime(2024, 1, 1, 20, 0)  # Monday
         assert is_business_hours(monday_8pm) is False
+    
+    def test_parse_datetime(self):
+        """Test datetime parsing across supported formats"""
+        assert parse_datetime("2024-01-02T03:04:05.120Z") == datetime(2024, 1, 2, 3, 4, 5, 120000)
+        assert parse_datetime("2024-01-02 03:04:05") == datetime(2024, 1, 2, 3, 4, 5)
+        assert parse_datetime("2024-1-2") == datetime(2024, 1, 2)
+        
+        # Unpadded time fields fall back to strptime
+        assert parse_datetime("2024-1-5T9:05:03") == datetime(2024, 1, 5, 9, 5, 3)
+        assert parse_datetime("2024-1-5 9:0:0") == datetime(2024, 1, 5, 9, 0, 0)
+        assert parse_datetime("2024-1-5T9:05:03Z") == datetime(2024, 1, 5, 9, 5, 3)
+        assert parse_datetime("not a date") is None
 
 
 class TestProductivityScore:
@@ -132,4 +213,124 @@ class TestProductivityScore:
         
         # Maximum score
         score = calculate_productivity_score(0, 2, 10, 5)
-        assert score <= 100
\ No newline at end of file
+        assert score <= 100
+    
+    def test_calculate_productivity_score_batch(self):
+        """Test vectorized scores match the scalar function"""
+        rows = [(3, 2, 10, 5), (10, 0, 0, 0), (0, 0, 0, 0), (5, 1, 3, 2), (7, 3, 20, 9)]
+        columns = [np.array(column) for column in zip(*rows)]
+        scores = calculate_productivity_score_batch(*columns)
+        assert scores.tolist() == [calculate_productivity_score(*row) for row in rows]
+
+
+class TestRateLimiter:
+    """Test in-memory rate limiter"""
+    
+    def test_blocks_after_limit(self):
+        """Test requests beyond the limit are rejected"""
+        limiter = RateLimiter(max_requests=3, window_seconds=3600)
+        assert all(limiter.is_allowed("1.2.3.4") for _ in range(3))
+        assert limiter.is_allowed("1.2.3.4") is False
+    
+    def test_keys_are_independent(self):
+        """Test each key has its own budget"""
+        limiter = RateLimiter(max_requests=1, window_seconds=3600)
+        assert limiter.is_allowed("a") is True
+        assert limiter.is_allowed("b") is True
+        assert limiter.is_allowed("a") is False
+    
+    def test_idle_keys_are_evicted(self, monkeypatch):
+        """Test keys idle for a full window are swept"""
+        clock = iter([0, 0, 2_000_000_000])
+        monkeypatch.setattr("utils.time.monotonic_ns", lambda: next(clock))
+        monkeypatch.setattr("utils.RATE_LIMIT_SWEEP_INTERVAL", 3)
+        limiter = RateLimiter(max_requests=1, window_seconds=1, shards=1)
+        limiter.is_allowed("a")
+        limiter.is_allowed("b")
+        assert limiter.is_allowed("c") is True
+        assert len(limiter) == 1
+    
+    def test_concurrent_checks_do_not_over_admit(self):
+        """Test threads sharing a key never exceed its budget"""
+        limiter = RateLimiter(max_requests=100, window_seconds=3600)
+        admitted = []
+        
+        def worker():
+            admitted.append(sum(limiter.is_allowed("shared") for _ in range(50)))
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sum(admitted) == 100
+
+
+class TestRedisRateLimiter:
+    """Test the Redis limiter falls back when Redis cannot answer"""
+    
+    def test_falls_back_when_redis_refuses_connections(self):
+        """Test an unreachable Redis uses the in-memory limiter"""
+        async def check():
+            limiter = RedisRateLimiter("redis://127.0.0.1:1/0", max_requests=2, window_seconds=60)
+            return [await limiter.is_allowed_async("client") for _ in range(3)]
+        
+        assert asyncio.run(check()) == [True, True, False]
+    
+    def test_falls_back_when_redis_does_not_respond(self):
+        """Test a Redis that accepts but never answers times out instead of hanging"""
+        async def check():
+            # Accepts connections and then stays silent, like a blackholed Redis
+            server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                limiter = RedisRateLimiter(f"redis://127.0.0.1:{port}/0", max_requests=1, window_seconds=60)
+                start = time.monotonic()
+                first = await limiter.is_allowed_async("client")
+                first_elapsed = time.monotonic() - start
+                
+                # Within the retry delay Redis is skipped entirely
+                start = time.monotonic()
+                second = await limiter.is_allowed_async("client")
+                second_elapsed = time.monotonic() - start
+            finally:
+                server.close()
+            return first, first_elapsed, second, second_elapsed
+        
+        first, first_elapsed, second, second_elapsed = asyncio.run(check())
+        assert first is True
+        assert first_elapsed < 5
+        assert second is False
+        assert second_elapsed < 0.1
+
+
+class TestRetryWithBackoff:
+    """Test async retry decorator"""
+    
+    def test_retries_listed_exceptions(self):
+        """Test listed exceptions are retried until the call succeeds"""
+        calls = []
+        
+        @retry_with_backoff(max_retries=3, backoff_factor=0, exceptions=(ConnectionError,))
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConnectionError("down")
+            return "ok"
+        
+        assert asyncio.run(flaky()) == "ok"
+        assert len(calls) == 3
+    
+    def test_other_exceptions_are_not_retried(self):
+        """Test exceptions outside the whitelist propagate immediately"""
+        calls = []
+        
+        @retry_with_backoff(max_retries=3, backoff_factor=0, exceptions=(ConnectionError,))
+        async def broken():
+            calls.append(1)
+            raise ValueError("bad request")
+        
+        with pytest.raises(ValueError):
+            asyncio.run(broken())
+        assert len(calls) == 1
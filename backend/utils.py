@@ -4,65 +4,110 @@ Utility functions for the AI Productivity Dashboard
 import re
 import hashlib
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
-from functools import wraps
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Any, Tuple, Type
+from functools import lru_cache, partial, wraps
+from itertools import chain
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
-logger = logging.getLogger(__name__)
+import numpy as np
 
-# Thread pool for CPU-bound tasks
-thread_pool = ThreadPoolExecutor(max_workers=4)
+logger = logging.getLogger(__name__)
 
+try:
+    import re2 as scan_re
+except ImportError:
+    logger.info("google-re2 not installed, using the re module for text scanning")
+    scan_re = re
+
+try:
+    import xxhash
+    cache_key_hasher = xxhash.xxh3_128
+except ImportError:
+    logger.info("xxhash not installed, using blake2b for cache keys")
+    cache_key_hasher = partial(hashlib.blake2b, digest_size=16)
+
+# Text patterns, compiled once at import
+# URL scanning runs on RE2 when installed: linear time, no catastrophic backtracking.
+# EMAIL_RE stays on re because RE2's \b is ASCII-only and would change matches next to accented letters.
+URL_RE = scan_re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+CLEAN_RE = scan_re.compile(r'<[^>]+>|' + URL_RE.pattern)
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}')
+VALID_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
 
 def run_in_thread(func):
-    """Decorator to run CPU-bound functions in thread pool"""
+    """Decorator to run CPU-bound functions in the event loop's default executor"""
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(thread_pool, func, *args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
     return wrapper
 
 
+@lru_cache(maxsize=2048)
 def clean_text(text: str) -> str:
     """Clean and normalize text for processing"""
     if not text:
         return ""
     
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove email headers and signatures
-    text = re.sub(r'From:.*?Subject:.*?\n', '', text, flags=re.DOTALL)
-    text = re.sub(r'--\s*\n.*', '', text, flags=re.DOTALL)
-    
-    # Remove URLs
-    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    # Plain text without tags or links only needs whitespace collapsed
+    if '<' not in text and 'http' not in text:
+        return ' '.join(text.split())
     
-    return text.strip()
+    # Drop tags and URLs in one scan, then collapse whitespace
+    return ' '.join(CLEAN_RE.sub('', text).split())
 
 
 def extract_email_addresses(text: str) -> List[str]:
     """Extract email addresses from text"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    return re.findall(email_pattern, text)
+    return EMAIL_RE.findall(text)
 
 
 def extract_phone_numbers(text: str) -> List[str]:
-    """Extract phone numbers from text"""
-    phone_pattern = r'(\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'
-    matches = re.findall(phone_pattern, text)
-    return [''.join(match) for match in matches]
+    """Extract phone numbers from text, as written"""
+    return PHONE_RE.findall(text)
 
 
 def extract_urls(text: str) -> List[str]:
     """Extract URLs from text"""
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    return re.findall(url_pattern, text)
+    return URL_RE.findall(text)
+
+
+# Word -> bit position shared by all similarity bitsets; reset once it reaches the cap.
+# _vocab_lock guards the vocabulary and the _word_bits cache, so a reset in one
+# thread cannot land between another thread's two lookups
+WORD_VOCAB_LIMIT = 1 << 16
+_word_ids: Dict[str, int] = {}
+_vocab_generation = 0
+_vocab_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1024)
+def _word_bits(text: str) -> Tuple[int, int, int]:
+    """Bitset of a text's lowercased words with its popcount and vocabulary generation.
+    
+    Callers must hold _vocab_lock.
+    """
+    global _vocab_generation
+    if len(_word_ids) >= WORD_VOCAB_LIMIT:
+        _word_ids.clear()
+        _word_bits.cache_clear()
+        _vocab_generation += 1
+    
+    ids = [_word_ids.setdefault(word, len(_word_ids)) for word in text.lower().split()]
+    if not ids:
+        return 0, 0, _vocab_generation
+    
+    # Set bits in a byte buffer and convert once rather than growing an int per word
+    buffer = bytearray(max(ids) // 8 + 1)
+    for word_id in ids:
+        buffer[word_id >> 3] |= 1 << (word_id & 7)
+    bits = int.from_bytes(buffer, 'little')
+    return bits, bits.bit_count(), _vocab_generation
 
 
 def calculate_text_similarity(text1: str, text2: str) -> float:
@@ -70,46 +115,126 @@ def calculate_text_similarity(text1: str, text2: str) -> float:
     if not text1 or not text2:
         return 0.0
     
-    words1 = set(text1.lower().split())
-    words2 = set(text2.lower().split())
+    with _vocab_lock:
+        bits1, count1, generation1 = _word_bits(text1)
+        bits2, count2, generation2 = _word_bits(text2)
+        if generation1 != generation2:
+            # Encoding text2 reset the vocabulary; re-encode the stale text
+            bits1, count1, _ = _word_bits(text1)
+    
+    # Union size follows from the intersection, so only one AND and popcount are needed
+    intersection = (bits1 & bits2).bit_count()
+    union = count1 + count2 - intersection
     
-    intersection = words1.intersection(words2)
-    union = words1.union(words2)
+    return intersection / union if union else 0.0
+
+
+def _make_jaccard_kernel(prange):
+    """Build the jaccard_matrix kernel around a parallel (numba.prange) or plain range loop"""
+    def _jaccard_matrix_kernel(offsets: np.ndarray, tokens: np.ndarray) -> np.ndarray:
+        """Pairwise Jaccard over documents stored as sorted token-id runs in one flat array"""
+        n = len(offsets) - 1
+        scores = np.zeros((n, n))
+        for i in prange(n):
+            start_i, end_i = offsets[i], offsets[i + 1]
+            if end_i > start_i:
+                scores[i, i] = 1.0
+            for j in range(i + 1, n):
+                start_j, end_j = offsets[j], offsets[j + 1]
+                # Two-pointer merge over the sorted ids counts the intersection
+                p, q, intersection = start_i, start_j, 0
+                while p < end_i and q < end_j:
+                    if tokens[p] == tokens[q]:
+                        intersection += 1
+                        p += 1
+                        q += 1
+                    elif tokens[p] < tokens[q]:
+                        p += 1
+                    else:
+                        q += 1
+                union = (end_i - start_i) + (end_j - start_j) - intersection
+                if union:
+                    scores[i, j] = scores[j, i] = intersection / union
+        return scores
     
-    return len(intersection) / len(union) if union else 0.0
+    return _jaccard_matrix_kernel
+
+
+@lru_cache(maxsize=1)
+def _get_jaccard_kernel():
+    """Import numba and compile the kernel on first use, keeping both off the import path"""
+    try:
+        from numba import njit, prange
+    except ImportError:
+        logger.info("numba not installed, jaccard_matrix runs in pure Python")
+        return _make_jaccard_kernel(range)
+    return njit(parallel=True, cache=True)(_make_jaccard_kernel(prange))
+
+
+def jaccard_matrix(texts: List[str]) -> np.ndarray:
+    """Pairwise calculate_text_similarity scores for many texts as an N x N matrix"""
+    vocab: Dict[str, int] = {}
+    rows = [
+        sorted({vocab.setdefault(word, len(vocab)) for word in text.lower().split()}) if text else []
+        for text in texts
+    ]
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(row) for row in rows])
+    tokens = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=int(offsets[-1]))
+    return _get_jaccard_kernel()(offsets, tokens)
+
 
+def generate_cache_key(*args) -> bytes:
+    """Generate a 16-byte cache key from arguments"""
+    # Feed arguments straight into the hasher instead of joining them into one string first.
+    # repr() keeps 1 and '1' apart, and the unit separator can't be confused with argument text.
+    hasher = cache_key_hasher()
+    for arg in args:
+        hasher.update(repr(arg).encode())
+        hasher.update(b'\x1f')
+    return hasher.digest()
 
-def generate_cache_key(*args) -> str:
-    """Generate a cache key from arguments"""
-    key_string = '|'.join(str(arg) for arg in args)
-    return hashlib.md5(key_string.encode()).hexdigest()
+
+FILE_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
 
 
 def format_file_size(bytes_size: int) -> str:
     """Format file size in human readable format"""
-    if not bytes_size or bytes_size == 0:
+    if not bytes_size or bytes_size <= 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while bytes_size >= 1024 and i < len(size_names) - 1:
-        bytes_size /= 1024.0
-        i += 1
-    
-    return f"{bytes_size:.1f} {size_names[i]}"
+    # Each unit is 2**10 times the previous one, so the bit length picks it directly;
+    # fractional sizes under one byte have a bit length of 0 and stay in bytes
+    exp = min(max(0, (int(bytes_size).bit_length() - 1) // 10), len(FILE_SIZE_UNITS) - 1)
+    return f"{bytes_size / (1 << (exp * 10)):.1f} {FILE_SIZE_UNITS[exp]}"
+
+
+# strptime formats tried when fromisoformat fails; strptime also accepts
+# fields without zero padding, e.g. 2024-1-5T9:05:03
+DATETIME_FALLBACK_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+)
 
 
 def parse_datetime(date_string: str) -> Optional[datetime]:
     """Parse datetime string with multiple format support"""
-    formats = [
-        "%Y-%m-%dT%H:%M:%S.%fZ",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d",
-    ]
+    # fromisoformat is implemented in C and handles the common, zero-padded ISO 8601 forms
+    try:
+        parsed = datetime.fromisoformat(date_string)
+    except ValueError:
+        parsed = None
     
-    for fmt in formats:
+    if parsed is not None:
+        # Offsets (including 'Z') are normalised to naive UTC like the other formats
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    
+    for fmt in DATETIME_FALLBACK_FORMATS:
         try:
             return datetime.strptime(date_string, fmt)
         except ValueError:
@@ -119,14 +244,19 @@ def parse_datetime(date_string: str) -> Optional[datetime]:
     return None
 
 
+# Business hours (9 AM - 6 PM, Mon-Fri) indexed by weekday * 24 + hour
+BUSINESS_HOURS_TABLE = tuple(
+    weekday < 5 and 9 <= hour < 18  # Monday = 0, Friday = 4
+    for weekday in range(7) for hour in range(24)
+)
+
+
 def is_business_hours(dt: datetime) -> bool:
     """Check if datetime is within business hours (9 AM - 6 PM, Mon-Fri)"""
-    return (
-        dt.weekday() < 5 and  # Monday = 0, Friday = 4
-        9 <= dt.hour < 18
-    )
+    return BUSINESS_HOURS_TABLE[dt.weekday() * 24 + dt.hour]
 
 
+@lru_cache(maxsize=8192)
 def calculate_productivity_score(
     meetings_today: int,
     focus_blocks: int,
@@ -134,33 +264,51 @@ def calculate_productivity_score(
     tasks_completed: int
 ) -> int:
     """Calculate productivity score based on various metrics"""
-    score = 100
+    # Meeting penalty: 5 per meeting over 4 (up to 10), or 10 per meeting over 6 once that is larger
+    meeting_penalty = max(min(max(meetings_today - 4, 0), 2) * 5, max(meetings_today - 6, 0) * 10)
     
-    # Penalize too many meetings
-    if meetings_today > 6:
-        score -= (meetings_today - 6) * 10
-    elif meetings_today > 4:
-        score -= (meetings_today - 4) * 5
-    
-    # Reward focus blocks
-    score += min(focus_blocks * 15, 30)
+    score = (
+        100
+        - meeting_penalty
+        + min(focus_blocks * 15, 30)  # Reward focus blocks
+        + min(emails_processed * 2, 20)  # Reward email processing
+        + min(tasks_completed * 5, 25)  # Reward task completion
+    )
     
-    # Reward email processing
-    score += min(emails_processed * 2, 20)
+    return max(0, min(100, score))
+
+
+def calculate_productivity_score_batch(
+    meetings_today: np.ndarray,
+    focus_blocks: np.ndarray,
+    emails_processed: np.ndarray,
+    tasks_completed: np.ndarray
+) -> np.ndarray:
+    """Vectorized calculate_productivity_score over equal-length integer arrays"""
+    meeting_penalty = np.maximum(
+        np.clip(meetings_today - 4, 0, 2) * 5,
+        np.maximum(meetings_today - 6, 0) * 10
+    )
     
-    # Reward task completion
-    score += min(tasks_completed * 5, 25)
+    score = (
+        100
+        - meeting_penalty
+        + np.minimum(focus_blocks * 15, 30)
+        + np.minimum(emails_processed * 2, 20)
+        + np.minimum(tasks_completed * 5, 25)
+    )
     
-    return max(0, min(100, score))
+    return np.clip(score, 0, 100)
+
+
+# Characters not allowed in stored filenames, each mapped to '_'
+INVALID_FILENAME_CHARS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
 
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe storage"""
-    # Remove or replace invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    
-    # Remove leading/trailing spaces and dots
-    filename = filename.strip(' .')
+    # Replace invalid characters, then remove leading/trailing spaces and dots
+    filename = filename.translate(INVALID_FILENAME_CHARS).strip(' .')
     
     # Limit length
     if len(filename) > 255:
@@ -172,66 +320,201 @@ def sanitize_filename(filename: str) -> str:
 
 def validate_email(email: str) -> bool:
     """Validate email address format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return VALID_EMAIL_RE.fullmatch(email) is not None
 
 
 def mask_sensitive_data(data: str, mask_char: str = '*') -> str:
     """Mask sensitive data for logging"""
-    if not data or len(data) < 4:
-        return mask_char * len(data) if data else ""
+    if not data:
+        return ""
+    
+    length = len(data)
+    if length < 4:
+        return mask_char * length
     
-    return data[:2] + mask_char * (len(data) - 4) + data[-2:]
+    return f"{data[:2]}{mask_char * (length - 4)}{data[-2:]}"
 
 
-def retry_with_backoff(max_retries: int = 3, backoff_factor: float = 1.0):
-    """Decorator for retrying functions with exponential backoff"""
+def retry_with_backoff(
+    max_retries: int = 3,
+    backoff_factor: float = 1.0,
+    exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    jitter: bool = True
+):
+    """Decorator for retrying functions with exponential backoff.
+    
+    Only exceptions listed in ``exceptions`` are retried; anything else propagates
+    immediately. With ``jitter`` each wait is scaled by a random factor in [0.5, 1.5)
+    so clients failing together don't retry in lockstep.
+    """
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
+            for attempt in range(max_retries - 1):
                 try:
                     return await func(*args, **kwargs)
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    
+                except exceptions as e:
                     wait_time = backoff_factor * (2 ** attempt)
-                    logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
+                    if jitter:
+                        wait_time *= 0.5 + random.random()
+                    logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait_time:.2f}s...")
                     await asyncio.sleep(wait_time)
             
+            # Final attempt: let any failure propagate to the caller
+            return await func(*args, **kwargs)
+            
         return wrapper
     return decorator
 
 
+RATE_LIMIT_SWEEP_INTERVAL = 4096  # checks per shard between sweeps for idle rate limit keys
+RATE_LIMIT_SHARDS = 16
+
+
+class _RateLimitShard:
+    """One lock-protected slice of the rate limiter's buckets"""
+    __slots__ = ("lock", "buckets", "checks")
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> (credits, last refill time in monotonic ns), least recently seen first
+        self.buckets: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self.checks = 0
+
+
 class RateLimiter:
-    """Simple in-memory rate limiter"""
+    """Simple in-memory token-bucket rate limiter.
+    
+    Each key keeps two ints instead of a log of request timestamps, so a check
+    costs the same and uses the same memory however busy the key is. Keys are
+    spread over independently locked shards, so the limiter is safe to share
+    between threads without serializing unrelated keys.
+    """
     
-    def __init__(self, max_requests: int, window_seconds: int):
+    def __init__(self, max_requests: int, window_seconds: int, max_keys: int = 100_000,
+                 shards: int = RATE_LIMIT_SHARDS):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, List[datetime]] = {}
+        self.max_keys = max_keys
+        # Integer fixed point: a token is worth window_ns credits and buckets refill by
+        # max_requests credits per nanosecond, so refilling never needs float division
+        self.window_ns = window_seconds * 1_000_000_000
+        self.capacity = max_requests * self.window_ns
+        self._shards = [_RateLimitShard() for _ in range(shards)]
+        self._shard_max_keys = -(-max_keys // shards)
+    
+    def __len__(self) -> int:
+        """Number of keys currently tracked"""
+        return sum(len(shard.buckets) for shard in self._shards)
     
     def is_allowed(self, key: str) -> bool:
         """Check if request is allowed for given key"""
-        now = datetime.utcnow()
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            buckets = shard.buckets
+            now = time.monotonic_ns()
+            credits, last = buckets.get(key, (self.capacity, now))
+            credits = min(self.capacity, credits + (now - last) * self.max_requests)
+            
+            allowed = credits >= self.window_ns
+            if allowed:
+                credits -= self.window_ns
+            
+            buckets[key] = (credits, now)
+            buckets.move_to_end(key)
+            
+            # Evict the least recently seen key once over capacity
+            if len(buckets) > self._shard_max_keys:
+                buckets.popitem(last=False)
+            
+            shard.checks += 1
+            if shard.checks % RATE_LIMIT_SWEEP_INTERVAL == 0:
+                self._evict_idle(buckets, now)
         
-        if key not in self.requests:
-            self.requests[key] = []
+        return allowed
+    
+    async def is_allowed_async(self, key: str) -> bool:
+        """Awaitable form of is_allowed, matching RedisRateLimiter"""
+        return self.is_allowed(key)
+    
+    def _evict_idle(self, buckets: "OrderedDict[str, Tuple[int, int]]", now: int):
+        """Drop keys idle for a full window; their buckets have refilled, same as an unseen key"""
+        # Buckets are in least-recently-seen order, so idle keys are all at the front
+        while buckets:
+            key, (_, last) = next(iter(buckets.items()))
+            if now - last < self.window_ns:
+                break
+            del buckets[key]
+
+
+# Fixed window per key: INCR the counter, start its expiry on the first hit
+REDIS_RATE_LIMIT_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+if count > tonumber(ARGV[1]) then
+    return 0
+end
+return 1
+"""
+
+# A rate limit check must never stall a request: give up on Redis quickly,
+# then skip it for a while before trying again
+REDIS_TIMEOUT_SECONDS = 0.5
+REDIS_RETRY_SECONDS = 5.0
+
+
+class RedisRateLimiter:
+    """Fixed-window rate limiter shared by every worker process through Redis.
+    
+    Falls back to a per-process RateLimiter while Redis is unreachable,
+    trying Redis again every REDIS_RETRY_SECONDS.
+    """
+    
+    def __init__(self, url: str, max_requests: int, window_seconds: int, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
         
-        # Remove old requests outside the window
-        self.requests[key] = [
-            req_time for req_time in self.requests[key]
-            if now - req_time < timedelta(seconds=self.window_seconds)
-        ]
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.prefix = prefix
+        # Connections are opened on first use, inside the worker that makes the call
+        self._redis = redis.from_url(
+            url,
+            socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+            socket_timeout=REDIS_TIMEOUT_SECONDS
+        )
+        self._script = self._redis.register_script(REDIS_RATE_LIMIT_SCRIPT)
+        self._fallback = RateLimiter(max_requests, window_seconds)
+        self._retry_at = 0.0
+    
+    async def is_allowed_async(self, key: str) -> bool:
+        """Check if request is allowed for given key"""
+        from redis.exceptions import RedisError
         
-        # Check if under limit
-        if len(self.requests[key]) < self.max_requests:
-            self.requests[key].append(now)
-            return True
+        if time.monotonic() < self._retry_at:
+            return self._fallback.is_allowed(key)
         
-        return False
-
-
-# Global rate limiter instance
-rate_limiter = RateLimiter(max_requests=100, window_seconds=3600)
\ No newline at end of file
+        try:
+            allowed = await self._script(
+                keys=[self.prefix + key], args=[self.max_requests, self.window_seconds]
+            )
+            return allowed == 1
+        except (RedisError, asyncio.TimeoutError, OSError) as e:
+            logger.warning(f"Redis rate limiter unavailable, limiting per process: {e}")
+            self._retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            return self._fallback.is_allowed(key)
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter():
+    """Return the process-wide rate limiter, backed by Redis when REDIS_URL is set"""
+    from config import RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW, get_settings
+    
+    redis_url = get_settings().redis_url
+    if redis_url:
+        try:
+            return RedisRateLimiter(redis_url, RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
+        except ImportError:
+            logger.warning("REDIS_URL is set but redis is not installed, using in-memory rate limiting")
+    return RateLimiter(max_requests=RATE_LIMIT_REQUESTS, window_seconds=RATE_LIMIT_WINDOW)